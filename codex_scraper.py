@@ -7,17 +7,398 @@ Connects to existing Chrome browser instance via CDP.
 import asyncio
 import json
 import os
+import stat
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
 from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fail slow navigations quickly instead of stalling a worker for a minute
+NAVIGATION_TIMEOUT = 30000
+
+# Navigation attempts per task; timeouts and 5xx responses are retried with
+# exponential backoff (1s, 2s, ...) so transient failures don't need a rerun
+NAVIGATION_ATTEMPTS = 3
+
+# Selectors are passed into the in-page extractors as arguments.
+PROMPT_SELECTOR = 'div.px-4.text-sm.break-words.whitespace-pre-wrap'
+# Log containers in priority order. They are tried one at a time (inside a
+# single evaluate) because a compound selector returns matches in document
+# order, which would let a code block in the prompt beat the logs container.
+LOG_SELECTORS = [
+    # An accessible log region is the most specific signal, so it goes first
+    '[role="log"]',
+    'div.react-scroll-to-bottom--css-siqfy-1n7m0yu',
+    '[class*="react-scroll-to-bottom"]',
+    'pre',
+    'code',
+    'div[class*="overflow-auto"]',
+]
+PR_LINK_SELECTORS = 'a[href*="github.com"], a[href*="/pull/"]'
+
+# Images, fonts and media the scraper never reads. Stylesheets are still
+# loaded since the page's layout affects innerText and the rendered log markup.
+BLOCKED_EXTENSIONS = ("png", "jpg", "jpeg", "gif", "webp", "avif", "ico",
+                      "woff", "woff2", "ttf", "otf", "mp4", "webm", "mp3")
+
+# Telemetry hosts whose beacons add requests to every page load. Feature-flag
+# services are deliberately not listed, since the app may not render without them.
+BLOCKED_TELEMETRY_HOSTS = ("sentry.io", "segment.io", "segment.com", "google-analytics.com",
+                           "googletagmanager.com", "datadoghq.com")
+
+# Blocked with CDP's Network.setBlockedURLs rather than Playwright routing:
+# routing turns off the HTTP cache and sends every request through Python,
+# so each task page re-downloaded the app's (normally cached) JS and CSS.
+BLOCKED_URL_PATTERNS = [
+    *(f"*.{ext}" for ext in BLOCKED_EXTENSIONS),
+    *(f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS),
+    *(f"*://*.{host}/*" for host in BLOCKED_TELEMETRY_HOSTS),
+]
+
+# XPath can match on text, so the Logs tab is found by the browser's own
+# evaluator rather than by comparing every button's label
+LOGS_TAB_XPATH = '//button[normalize-space(.)="Logs"]'
+
+# Size hint (bytes) for each chunk of lines read from the URL list
+URL_READ_CHUNK = 64 * 1024
+
+# Holds the output once the Logs tab has loaded it; matches the same
+# containers as the first entries of LOG_SELECTORS
+LOGS_CONTAINER_SELECTOR = '[role="log"], [class*="react-scroll-to-bottom"]'
+
+# The extractors below run entirely in the page and return plain JSON, so
+# each one costs a single CDP round-trip no matter how large the DOM is.
+EXTRACT_PROMPT_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    return el ? {text: el.innerText, html: el.innerHTML} : null;
+}
+"""
+
+FIND_LOGS_TAB_JS = """
+(xpath) => {
+    const tab = document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    return {
+        found: tab !== null,
+        selected: tab !== null && tab.getAttribute('aria-selected') === 'true',
+    };
+}
+"""
+
+EXTRACT_LOGS_JS = """
+async ({selectors, container, timeout}) => {
+    // Only consider elements with substantial content
+    const hasLogText = el => el.innerText.trim().length > 50;
+
+    // Wait until a logs container holds its output (not merely renders),
+    // watching DOM mutations rather than polling from Python, and give up
+    // quietly after the timeout. This uses the same test as the pick below,
+    // so an empty container can't let a prompt code block win.
+    const ready = () => Array.from(document.querySelectorAll(container)).some(hasLogText);
+    if (!ready()) {
+        await new Promise(resolve => {
+            const done = () => {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve();
+            };
+            const observer = new MutationObserver(() => { if (ready()) done(); });
+            const timer = setTimeout(done, timeout);
+            observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+        });
+    }
+
+    // Look for log content in the possible containers, in priority order
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (hasLogText(el)) {
+                return {found_selector: selector, html: el.innerHTML};
+            }
+        }
+    }
+
+    // Fall back to the main content area if it looks like build output;
+    // a case-insensitive regex avoids lowercasing a copy of the whole text
+    const main = document.querySelector('div[class*="flex-1"]');
+    if (main && /ruff|pytest|error/i.test(main.textContent)) {
+        return {found_selector: 'main_content_fallback', html: main.innerHTML};
+    }
+    return null;
+}
+"""
+
+EXTRACT_METADATA_JS = """
+(prLinkSelectors) => {
+    const metadata = {title: document.title};
+
+    // Look for GitHub PR URL, preferring the "View Pull Request" button
+    const prCandidates = [
+        Array.from(document.querySelectorAll('a'))
+            .find(a => a.textContent.includes('View Pull Request')),
+        ...document.querySelectorAll(prLinkSelectors),
+    ];
+    for (const link of prCandidates) {
+        const href = link && link.getAttribute('href');
+        if (href && href.includes('github.com') && href.includes('/pull/')) {
+            metadata.github_pr_url = href;
+            break;
+        }
+    }
+
+    // Look for repository information: a span whose text has exactly one "/"
+    const repo = document.evaluate(
+        '//span[contains(text(), "/") and ' +
+        'string-length(text()) - string-length(translate(text(), "/", "")) = 1]',
+        document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    if (repo) {
+        metadata.repository = repo.innerText;
+    }
+
+    // Look for dates
+    const monthPattern = /\\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)/;
+    for (const span of document.querySelectorAll('span[class*="text-token-text-secondary"]')) {
+        const text = span.innerText;
+        if (monthPattern.test(text)) {
+            metadata.date = text;
+            break;
+        }
+    }
+
+    // Look for PR stats (+/- lines)
+    let additions = 0, deletions = 0;
+    for (const span of document.querySelectorAll('span[class*="text-green-500"], span[class*="text-red-500"]')) {
+        const match = /^([+-])(\\d+)$/.exec(span.innerText);
+        if (!match) {
+            continue;
+        }
+        if (match[1] === '+') {
+            additions = parseInt(match[2], 10);
+        } else {
+            deletions = parseInt(match[2], 10);
+        }
+    }
+    if (additions || deletions) {
+        metadata.changes = {additions, deletions};
+    }
+
+    return metadata;
+}
+"""
+
+# Shared stylesheet for the per-task logs pages, written once into the
+# output directory rather than inlined into every file
+LOGS_CSS_FILENAME = "logs.css"
+LOGS_CSS = """\
+body {
+    font-family: 'SF Mono', Monaco, 'Cascadia Code', 'Roboto Mono', Consolas, 'Courier New', monospace;
+    margin: 20px;
+    line-height: 1.4;
+}
+
+.dark {
+    background-color: #1e1e1e;
+    color: #d4d4d4;
+}
+
+.whitespace-pre-wrap {
+    white-space: pre-wrap;
+    word-break: break-word;
+}
+
+.whitespace-pre {
+    white-space: pre;
+}
+
+/* ANSI colors */
+.ansi-black-fg { color: #000000; }
+.ansi-red-fg { color: #cd3131; }
+.ansi-green-fg { color: #0dbc79; }
+.ansi-yellow-fg { color: #e5e510; }
+.ansi-blue-fg { color: #2472c8; }
+.ansi-magenta-fg { color: #bc3fbc; }
+.ansi-cyan-fg { color: #11a8cd; }
+.ansi-white-fg { color: #e5e5e5; }
+
+.ansi-bright-black-fg { color: #666666; }
+.ansi-bright-red-fg { color: #f14c4c; }
+.ansi-bright-green-fg { color: #23d18b; }
+.ansi-bright-yellow-fg { color: #f5f543; }
+.ansi-bright-blue-fg { color: #3b8eea; }
+.ansi-bright-magenta-fg { color: #d670d6; }
+.ansi-bright-cyan-fg { color: #29b8db; }
+.ansi-bright-white-fg { color: #e5e5e5; }
+
+/* ANSI backgrounds */
+.ansi-black-bg { background-color: #000000; }
+.ansi-red-bg { background-color: #cd3131; }
+.ansi-green-bg { background-color: #0dbc79; }
+.ansi-yellow-bg { background-color: #e5e510; }
+.ansi-blue-bg { background-color: #2472c8; }
+.ansi-magenta-bg { background-color: #bc3fbc; }
+.ansi-cyan-bg { background-color: #11a8cd; }
+.ansi-white-bg { background-color: #e5e5e5; }
+
+/* ANSI styles */
+.ansi-bold { font-weight: bold; }
+.ansi-dim { opacity: 0.7; }
+.ansi-italic { font-style: italic; }
+.ansi-underline { text-decoration: underline; }
+.ansi-strikethrough { text-decoration: line-through; }
+
+/* Progress bars and other common elements */
+.progress-bar {
+    display: inline-block;
+    background-color: #333;
+    border: 1px solid #555;
+}
+
+pre {
+    background-color: #2d2d2d;
+    padding: 15px;
+    border-radius: 5px;
+    overflow-x: auto;
+    border: 1px solid #404040;
+}
+
+.header {
+    background-color: #252526;
+    padding: 10px;
+    border-radius: 5px;
+    margin-bottom: 20px;
+    border: 1px solid #404040;
+}
+"""
+
+# Static pieces of each logs page, encoded once. Only the task ID (written
+# between the pieces, in the title and the header) and the logs vary per task.
+LOGS_HTML_PREFIX = b"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Logs - """
+LOGS_HTML_MIDDLE = f"""</title>
+    <link rel="stylesheet" href="{LOGS_CSS_FILENAME}">
+</head>
+<body>
+    <div class="header">
+        <h1>Codex Task Logs</h1>
+        <p>Task ID: """.encode('utf-8')
+LOGS_HTML_SUFFIX = b"""</p>
+    </div>
+    <div class="logs-content">
+        """
+LOGS_HTML_TAIL = b"""
+    </div>
+</body>
+</html>"""
+
+def dump_json(data, path: Path):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def encode_json_line(data) -> bytes:
+    """Encode data as a single line of UTF-8 JSON for a .jsonl file."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8')
+
+async def read_urls(path: str = 'codex_urls.txt') -> List[str]:
+    """Read the task URL list in a worker thread so the event loop stays free."""
+    text = await asyncio.to_thread(Path(path).read_text, encoding='utf-8')
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+async def stream_lines(f) -> AsyncIterator[str]:
+    """Yield the non-blank lines of an open text file, stripped, reading it a
+    chunk at a time in a worker thread."""
+    while lines := await asyncio.to_thread(f.readlines, URL_READ_CHUNK):
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+
+async def stream_tty_lines(f) -> AsyncIterator[str]:
+    """Yield lines from an interactive terminal as each one is entered.
+    
+    Reads happen in a daemon thread, so a pending read never holds up
+    shutdown, and the terminal is left in blocking mode (switching it to
+    non-blocking would affect stdout too, which shares the same tty).
+    """
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+    
+    def read_lines():
+        try:
+            for line in f:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+        except RuntimeError:
+            pass  # The event loop has already closed
+    
+    threading.Thread(target=read_lines, daemon=True).start()
+    while (line := await lines.get()) is not None:
+        yield line
+
+async def stream_urls(path: str = 'codex_urls.txt') -> AsyncIterator[str]:
+    """Yield task URLs from path without loading the whole file."""
+    with open(path, encoding='utf-8') as f:
+        async for url in stream_lines(f):
+            yield url
 
 class CodexScraper:
-    def __init__(self, cdp_url: str = "http://localhost:9222"):
+    def __init__(self, cdp_url: str = "http://localhost:9222", block_resources: bool = True,
+                 force_rescrape: bool = False):
         self.cdp_url = cdp_url
+        self.block_resources = block_resources
+        self.force_rescrape = force_rescrape
+        self.skipped_urls = 0
         self.output_dir = Path("codex_tasks")
         self.output_dir.mkdir(exist_ok=True)
+        self.results_file = self.output_dir / "results.jsonl"
+        self._css_written = False
+        self._css_lock = threading.Lock()
+        
+    def _scraped_task_ids(self) -> frozenset:
+        """Task IDs that already have a successful result saved in output_dir.
         
+        Failed results are saved as {task_id}.error.json, whose stem is not a
+        task ID, so failed tasks are retried on the next run. Empty when
+        force_rescrape is set, so every URL is scraped again.
+        """
+        if self.force_rescrape:
+            return frozenset()
+        return frozenset(path.stem for path in self.output_dir.glob('*.json'))
+    
+    def filter_pending(self, urls: List[str]) -> List[str]:
+        """Drop URLs whose task was already scraped successfully."""
+        done = self._scraped_task_ids()
+        pending = [url for url in urls if url.rsplit('/', 1)[-1] not in done]
+        self.skipped_urls += len(urls) - len(pending)
+        return pending
+    
+    async def stream_pending_urls(self, path: str = 'codex_urls.txt') -> AsyncIterator[str]:
+        """Stream URLs from path, skipping tasks saved by a previous run."""
+        done = await asyncio.to_thread(self._scraped_task_ids)
+        async for url in stream_urls(path):
+            if url.rsplit('/', 1)[-1] in done:
+                self.skipped_urls += 1
+            else:
+                yield url
+    
     async def connect_to_browser(self):
         """Connect to existing Chrome browser instance via CDP."""
         self.playwright = await async_playwright().start()
@@ -31,22 +412,37 @@ class CodexScraper:
             print("No browser contexts found. Make sure Chrome is running with --remote-debugging-port=9222")
             return None
         
-        context = contexts[0]
-        pages = context.pages
+        self.context = contexts[0]
+        pages = self.context.pages
         
         if not pages:
             # Create new page if none exist
-            self.page = await context.new_page()
+            self.page = await self.context.new_page()
         else:
             self.page = pages[0]
         
+        # This may be the user's own tab, so close() lifts the block again
+        if self.block_resources:
+            self.blocking_session = await self.block_unneeded_resources(self.page)
+        
         return self.page
+    
+    async def block_unneeded_resources(self, page: Page):
+        """Skip downloading images, fonts, media and telemetry on page.
+        
+        The block lasts until the page closes or the returned CDP session is
+        detached.
+        """
+        session = await self.context.new_cdp_session(page)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return session
 
-    async def extract_task_data(self, url: str) -> Dict:
+    async def extract_task_data(self, page: Page, url: str) -> Dict:
         """Extract all task data from a Codex task URL."""
         print(f"Scraping: {url}")
         
-        task_id = url.split('/')[-1]
+        task_id = url.rsplit('/', 1)[-1]
         task_data = {
             "url": url,
             "task_id": task_id,
@@ -57,22 +453,17 @@ class CodexScraper:
         }
         
         try:
-            # Navigate to the page
-            await self.page.goto(url, wait_until='load', timeout=60000)
-            await self.page.wait_for_timeout(3000)
-            
-            # Extract page title and metadata
-            title = await self.page.title()
-            task_data["metadata"]["title"] = title
+            # Navigate to the page; extract_prompt waits for the content
+            await self.navigate(page, url)
             
             # Extract the prompt
-            task_data["prompt"] = await self.extract_prompt()
+            task_data["prompt"] = await self.extract_prompt(page)
             
             # Extract logs
-            task_data["logs"] = await self.extract_logs()
+            task_data["logs"] = await self.extract_logs(page)
             
-            # Extract additional metadata
-            task_data["metadata"].update(await self.extract_metadata())
+            # Extract page title and additional metadata
+            task_data["metadata"].update(await self.extract_metadata(page))
             
         except Exception as e:
             print(f"Error extracting data from {url}: {e}")
@@ -80,194 +471,226 @@ class CodexScraper:
             
         return task_data
     
-    async def extract_prompt(self) -> Optional[Dict]:
+    async def navigate(self, page: Page, url: str):
+        """Load url, retrying timeouts and server errors with backoff.
+        
+        Client errors (4xx) are not retried, since reloading won't fix them.
+        Raises if the last attempt still times out or gets a server error,
+        so the task is saved with an error and retried on the next run.
+        """
+        for attempt in range(NAVIGATION_ATTEMPTS):
+            retry_in = 2 ** attempt
+            last_attempt = attempt == NAVIGATION_ATTEMPTS - 1
+            try:
+                response = await page.goto(url, wait_until='domcontentloaded')
+            except PlaywrightTimeoutError:
+                if last_attempt:
+                    raise
+                print(f"Timed out loading {url}, retrying in {retry_in}s")
+            else:
+                if not response or response.status < 500:
+                    return
+                if last_attempt:
+                    raise RuntimeError(f"HTTP {response.status} loading {url}")
+                print(f"Got HTTP {response.status} for {url}, retrying in {retry_in}s")
+            await asyncio.sleep(retry_in)
+    
+    async def extract_prompt(self, page: Page) -> Optional[Dict]:
         """Extract the main prompt text from the page."""
         try:
-            # Look for the prompt element
-            prompt_element = await self.page.query_selector('div.px-4.text-sm.break-words.whitespace-pre-wrap')
+            # The prompt is the first thing the task page renders
+            try:
+                await page.wait_for_selector(PROMPT_SELECTOR, timeout=10000)
+            except PlaywrightTimeoutError:
+                pass
             
-            if prompt_element:
-                text = await prompt_element.inner_text()
-                html = await prompt_element.inner_html()
-                
-                return {
-                    "text": text,
-                    "html": html
-                }
-            else:
+            prompt = await page.evaluate(EXTRACT_PROMPT_JS, PROMPT_SELECTOR)
+            if not prompt:
                 print("Prompt element not found")
-                return None
+            return prompt
                 
         except Exception as e:
             print(f"Error extracting prompt: {e}")
             return None
     
-    async def extract_logs(self) -> Optional[Dict]:
+    async def extract_logs(self, page: Page) -> Optional[Dict]:
         """Extract logs content by clicking on the Logs tab."""
         try:
-            # Find all buttons and look for the Logs tab
-            all_buttons = await self.page.query_selector_all('button')
-            logs_tab = None
-            
-            for button in all_buttons:
-                try:
-                    text = await button.inner_text()
-                    if text.strip() == "Logs":
-                        logs_tab = button
-                        break
-                except:
-                    continue
-            
-            if not logs_tab:
+            # Locate the Logs tab in-page, then give it a real mouse click
+            # since tab widgets may activate on mousedown rather than click
+            logs_tab = await page.evaluate(FIND_LOGS_TAB_JS, LOGS_TAB_XPATH)
+            if not logs_tab["found"]:
                 print("Logs tab not found")
                 return None
             
-            # Click on the Logs tab
-            await logs_tab.click()
-            await self.page.wait_for_timeout(2000)
-            
-            # Look for log content in various possible containers
-            log_selectors = [
-                'div.react-scroll-to-bottom--css-siqfy-1n7m0yu',
-                '[class*="react-scroll-to-bottom"]',
-                'pre',
-                'code',
-                'div[class*="overflow-auto"]'
-            ]
+            # No need to click if the page opened on the Logs tab
+            if not logs_tab["selected"]:
+                await page.locator(f"xpath={LOGS_TAB_XPATH}").first.click()
+            
+            # Waits in-page for the container, then extracts in the same call
+            logs = await page.evaluate(EXTRACT_LOGS_JS, {
+                "selectors": LOG_SELECTORS,
+                "container": LOGS_CONTAINER_SELECTOR,
+                "timeout": 5000,
+            })
+            if not logs:
+                print("No logs content found")
+                return None
             
-            logs_data = {
-                "found_selector": None,
-                "has_content": False
+            print(f"Found logs content using selector: {logs['found_selector']}")
+            return {
+                "found_selector": logs["found_selector"],
+                "has_content": True,
+                "_html": logs["html"]  # Store HTML temporarily for saving
             }
             
-            for selector in log_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    for element in elements:
-                        text = await element.inner_text()
-                        if len(text.strip()) > 50:  # Only consider elements with substantial content
-                            html = await element.inner_html()
-                            logs_data = {
-                                "found_selector": selector,
-                                "has_content": True,
-                                "_html": html  # Store HTML temporarily for saving
-                            }
-                            print(f"Found logs content using selector: {selector}")
-                            return logs_data
-                except Exception as e:
-                    continue
-            
-            # If no specific log container found, try to get all text from the main content area
-            try:
-                # Look for the main content area after clicking logs
-                main_content = await self.page.query_selector('div[class*="flex-1"]')
-                if main_content:
-                    text = await main_content.inner_text()
-                    html = await main_content.inner_html()
-                    if "ruff" in text.lower() or "pytest" in text.lower() or "error" in text.lower():
-                        logs_data = {
-                            "found_selector": "main_content_fallback",
-                            "has_content": True,
-                            "_html": html  # Store HTML temporarily for saving
-                        }
-                        print("Found logs content using main content fallback")
-                        return logs_data
-            except:
-                pass
-            
-            print("No logs content found")
-            return None
-            
         except Exception as e:
             print(f"Error extracting logs: {e}")
             return None
     
-    async def extract_metadata(self) -> Dict:
+    async def extract_metadata(self, page: Page) -> Dict:
         """Extract additional metadata from the page."""
         metadata = {}
         
         try:
-            # Look for GitHub PR URL in "View Pull Request" button
-            pr_link_selectors = [
-                'a:has-text("View Pull Request")',
-                'a[href*="github.com"]',
-                'a[href*="/pull/"]'
-            ]
-            
-            for selector in pr_link_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        href = await element.get_attribute('href')
-                        if href and 'github.com' in href and '/pull/' in href:
-                            metadata["github_pr_url"] = href
-                            print(f"Found GitHub PR URL: {href}")
-                            break
-                except:
-                    continue
-            
-            # Look for repository information
-            repo_elements = await self.page.query_selector_all('span:has-text("/")')
-            for element in repo_elements:
-                text = await element.inner_text()
-                if "/" in text and len(text.split("/")) == 2:
-                    metadata["repository"] = text
-                    break
-            
-            # Look for dates
-            date_elements = await self.page.query_selector_all('span[class*="text-token-text-secondary"]')
-            for element in date_elements:
-                text = await element.inner_text()
-                if any(month in text for month in ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-                                                  "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]):
-                    metadata["date"] = text
-                    break
-            
-            # Look for PR stats (+/- lines)
-            stat_elements = await self.page.query_selector_all('span[class*="text-green-500"], span[class*="text-red-500"]')
-            additions = deletions = 0
-            for element in stat_elements:
-                text = await element.inner_text()
-                if text.startswith("+"):
-                    additions = int(text[1:]) if text[1:].isdigit() else 0
-                elif text.startswith("-"):
-                    deletions = int(text[1:]) if text[1:].isdigit() else 0
-            
-            if additions or deletions:
-                metadata["changes"] = {"additions": additions, "deletions": deletions}
+            metadata = await page.evaluate(EXTRACT_METADATA_JS, PR_LINK_SELECTORS)
+            if "github_pr_url" in metadata:
+                print(f"Found GitHub PR URL: {metadata['github_pr_url']}")
             
         except Exception as e:
             print(f"Error extracting metadata: {e}")
         
         return metadata
     
-    async def scrape_urls(self, urls: List[str], max_concurrent: int = 5) -> List[Dict]:
-        """Scrape multiple URLs with concurrency control."""
-        results = []
-        
-        # Process URLs in batches to avoid overwhelming the browser
-        for i in range(0, len(urls), max_concurrent):
-            batch = urls[i:i + max_concurrent]
-            print(f"Processing batch {i//max_concurrent + 1}: {len(batch)} URLs")
-            
-            # For now, process sequentially to be safe with the shared browser instance
-            batch_results = []
-            for url in batch:
-                result = await self.extract_task_data(url)
-                batch_results.append(result)
-                
-                # Save individual result
-                await self.save_task_data(result)
-                
-                # Small delay between requests
-                await asyncio.sleep(1)
-            
-            results.extend(batch_results)
+    async def scrape_urls(self, urls: Union[Iterable[str], AsyncIterable[str]],
+                          max_concurrent: int = 5) -> Dict:
+        """Scrape multiple URLs concurrently, one browser tab per worker.
+        
+        urls may be a list or an (async) iterator; it is consumed lazily
+        through a bounded queue, so only a few URLs are buffered at a time.
+        Each result is saved to its own JSON file and appended to
+        results.jsonl as it completes; only the success/failure counts are
+        returned, so memory does not grow with the number of URLs.
+        """
+        pending_urls = asyncio.Queue(maxsize=max_concurrent * 2)
+        
+        # Results are saved by background writers so disk I/O never holds up
+        # the next navigation; one writer per worker lets saves run in
+        # parallel threads instead of queueing behind each other
+        pending_writes = asyncio.Queue()
+        counts = {"successful_scrapes": 0, "failed_scrapes": 0}
+        
+        async def feed_urls():
+            if isinstance(urls, AsyncIterable):
+                async for url in urls:
+                    await pending_urls.put(url)
+            else:
+                for url in urls:
+                    await pending_urls.put(url)
+            # One stop marker per worker
+            for _ in range(max_concurrent):
+                await pending_urls.put(None)
+        
+        async def scrape_worker():
+            # Each worker owns a tab in the logged-in context, opened on its
+            # first URL so short lists don't open more tabs than they need
+            page = None
+            try:
+                while (url := await pending_urls.get()) is not None:
+                    if page is None:
+                        page = await self.context.new_page()
+                        page.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+                        if self.block_resources:
+                            await self.block_unneeded_resources(page)
+                    result = await self.extract_task_data(page, url)
+                    counts["failed_scrapes" if result.get("error") else "successful_scrapes"] += 1
+                    pending_writes.put_nowait(result)
+            finally:
+                if page:
+                    await page.close()
+        
+        async def write_results(results_jsonl):
+            while True:
+                result = await pending_writes.get()
+                try:
+                    await self.save_task_data(result, results_jsonl)
+                except Exception as e:
+                    print(f"Error saving {result['task_id']}: {e}")
+                finally:
+                    pending_writes.task_done()
+        
+        print(f"Scraping with up to {max_concurrent} tabs")
+        with open(self.results_file, 'ab') as results_jsonl:
+            writers = [asyncio.create_task(write_results(results_jsonl))
+                       for _ in range(max_concurrent)]
+            try:
+                async with asyncio.TaskGroup() as workers:
+                    workers.create_task(feed_urls())
+                    for _ in range(max_concurrent):
+                        workers.create_task(scrape_worker())
+            finally:
+                # Save everything already scraped before stopping the writers,
+                # even when the run is cancelled (e.g. Ctrl-C in serve mode)
+                try:
+                    await asyncio.shield(pending_writes.join())
+                finally:
+                    for writer in writers:
+                        writer.cancel()
         
-        return results
+        return counts
     
-    async def save_task_data(self, task_data: Dict):
-        """Save task data to individual JSON file."""
+    async def serve(self, max_concurrent: int = 5):
+        """Scrape task URLs read from stdin, one per line, until it closes.
+        
+        The browser connection is made once and kept for the whole session,
+        so URLs can be fed in incrementally without paying for a reconnect,
+        e.g. `tail -f new_urls.txt | python run_scraper.py --serve`.
+        """
+        if not await self.connect_to_browser():
+            print("Failed to connect to browser")
+            return
+        
+        done = await asyncio.to_thread(self._scraped_task_ids)
+        
+        # The event loop watches pipes and sockets directly. Terminals are
+        # read line by line in a thread, and anything else, such as a
+        # regular file or /dev/null, is read in chunks in a thread.
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+        if stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode):
+            reader = asyncio.StreamReader()
+            loop = asyncio.get_running_loop()
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+            lines = (line.decode('utf-8') async for line in reader)
+        elif sys.stdin.isatty():
+            lines = stream_tty_lines(sys.stdin)
+        else:
+            lines = stream_lines(sys.stdin)
+        
+        async def stdin_urls():
+            async for line in lines:
+                url = line.strip()
+                if not url:
+                    continue
+                if url.rsplit('/', 1)[-1] in done:
+                    self.skipped_urls += 1
+                else:
+                    yield url
+        
+        print("Waiting for task URLs on stdin...")
+        counts = await self.scrape_urls(stdin_urls(), max_concurrent)
+        print(f"Summary: {counts['successful_scrapes']} successful, {counts['failed_scrapes']} failed, "
+              f"{self.skipped_urls} skipped as already scraped")
+    
+    async def save_task_data(self, task_data: Dict, results_jsonl=None):
+        """Save task data to individual JSON file.
+        
+        If results_jsonl (a file opened in binary append mode) is given, the
+        task data is also appended to it as one JSON line.
+        """
+        await asyncio.to_thread(self._write_task_data, task_data, results_jsonl)
+    
+    def _write_task_data(self, task_data: Dict, results_jsonl=None):
+        """Blocking half of save_task_data, run in a worker thread."""
         task_id = task_data["task_id"]
         
         # Extract HTML for logs before saving JSON
@@ -275,125 +698,46 @@ class CodexScraper:
         if task_data.get("logs") and task_data["logs"].get("_html"):
             logs_html = task_data["logs"].pop("_html")  # Remove HTML from logs data
         
-        # Save JSON without HTML content
-        output_file = self.output_dir / f"{task_id}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(task_data, f, indent=2, ensure_ascii=False)
+        # Save JSON without HTML content. Failures go to a separate file so
+        # the next run can tell them apart by name and scrape them again.
+        error_file = self.output_dir / f"{task_id}.error.json"
+        if task_data.get("error"):
+            dump_json(task_data, error_file)
+        else:
+            dump_json(task_data, self.output_dir / f"{task_id}.json")
+            error_file.unlink(missing_ok=True)
+        if results_jsonl:
+            # Writers share this file; each line goes out in a single write,
+            # which the buffered file serializes, so lines never interleave
+            results_jsonl.write(encode_json_line(task_data))
+            results_jsonl.flush()
         
         print(f"Saved data for {task_id}")
         
         # Also save logs as separate HTML file if available
         if logs_html:
+            self._ensure_css_written()
             html_file = self.output_dir / f"{task_id}_logs.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(self._create_styled_html(logs_html, task_id))
+            with open(html_file, 'wb') as f:
+                encoded_id = task_id.encode('utf-8')
+                f.writelines([LOGS_HTML_PREFIX, encoded_id, LOGS_HTML_MIDDLE, encoded_id,
+                              LOGS_HTML_SUFFIX, logs_html.encode('utf-8'), LOGS_HTML_TAIL])
     
-    def _create_styled_html(self, logs_html: str, task_id: str) -> str:
-        """Create a styled HTML document for logs."""
-        css = """
-        <style>
-            body {
-                font-family: 'SF Mono', Monaco, 'Cascadia Code', 'Roboto Mono', Consolas, 'Courier New', monospace;
-                margin: 20px;
-                line-height: 1.4;
-            }
-
-            .dark {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-            }
-            
-            .whitespace-pre-wrap {
-                white-space: pre-wrap;
-                word-break: break-word;
-            }
-            
-            .whitespace-pre {
-                white-space: pre;
-            }
-            
-            /* ANSI colors */
-            .ansi-black-fg { color: #000000; }
-            .ansi-red-fg { color: #cd3131; }
-            .ansi-green-fg { color: #0dbc79; }
-            .ansi-yellow-fg { color: #e5e510; }
-            .ansi-blue-fg { color: #2472c8; }
-            .ansi-magenta-fg { color: #bc3fbc; }
-            .ansi-cyan-fg { color: #11a8cd; }
-            .ansi-white-fg { color: #e5e5e5; }
-            
-            .ansi-bright-black-fg { color: #666666; }
-            .ansi-bright-red-fg { color: #f14c4c; }
-            .ansi-bright-green-fg { color: #23d18b; }
-            .ansi-bright-yellow-fg { color: #f5f543; }
-            .ansi-bright-blue-fg { color: #3b8eea; }
-            .ansi-bright-magenta-fg { color: #d670d6; }
-            .ansi-bright-cyan-fg { color: #29b8db; }
-            .ansi-bright-white-fg { color: #e5e5e5; }
-            
-            /* ANSI backgrounds */
-            .ansi-black-bg { background-color: #000000; }
-            .ansi-red-bg { background-color: #cd3131; }
-            .ansi-green-bg { background-color: #0dbc79; }
-            .ansi-yellow-bg { background-color: #e5e510; }
-            .ansi-blue-bg { background-color: #2472c8; }
-            .ansi-magenta-bg { background-color: #bc3fbc; }
-            .ansi-cyan-bg { background-color: #11a8cd; }
-            .ansi-white-bg { background-color: #e5e5e5; }
-            
-            /* ANSI styles */
-            .ansi-bold { font-weight: bold; }
-            .ansi-dim { opacity: 0.7; }
-            .ansi-italic { font-style: italic; }
-            .ansi-underline { text-decoration: underline; }
-            .ansi-strikethrough { text-decoration: line-through; }
-            
-            /* Progress bars and other common elements */
-            .progress-bar {
-                display: inline-block;
-                background-color: #333;
-                border: 1px solid #555;
-            }
-            
-            pre {
-                background-color: #2d2d2d;
-                padding: 15px;
-                border-radius: 5px;
-                overflow-x: auto;
-                border: 1px solid #404040;
-            }
-            
-            .header {
-                background-color: #252526;
-                padding: 10px;
-                border-radius: 5px;
-                margin-bottom: 20px;
-                border: 1px solid #404040;
-            }
-        </style>
-        """
-        
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Logs - {task_id}</title>
-    {css}
-</head>
-<body>
-    <div class="header">
-        <h1>Codex Task Logs</h1>
-        <p>Task ID: {task_id}</p>
-    </div>
-    <div class="logs-content">
-        {logs_html}
-    </div>
-</body>
-</html>"""
+    def _ensure_css_written(self):
+        """Write the shared logs stylesheet the first time it is needed."""
+        with self._css_lock:
+            if self._css_written:
+                return
+            (self.output_dir / LOGS_CSS_FILENAME).write_text(LOGS_CSS, encoding='utf-8')
+            self._css_written = True
     
     async def close(self):
         """Clean up resources."""
+        if hasattr(self, 'blocking_session'):
+            try:
+                await self.blocking_session.detach()
+            except Exception:
+                pass  # The page or browser is already gone
         if hasattr(self, 'browser'):
             await self.browser.close()
         if hasattr(self, 'playwright'):
@@ -401,13 +745,6 @@ class CodexScraper:
 
 async def main():
     """Main function to run the scraper."""
-    # Read URLs from file
-    urls = []
-    with open('codex_urls.txt', 'r') as f:
-        urls = [line.strip() for line in f if line.strip()]
-    
-    print(f"Found {len(urls)} URLs to scrape")
-    
     scraper = CodexScraper()
     
     try:
@@ -419,7 +756,7 @@ async def main():
         # Test with a single URL first
         test_url = "https://chatgpt.com/codex/tasks/task_e_682bcb3a96a88323b415a5326b690b26"
         print("Testing with single URL...")
-        result = await scraper.extract_task_data(test_url)
+        result = await scraper.extract_task_data(page, test_url)
         await scraper.save_task_data(result)
         
         print("Test result:")
@@ -427,22 +764,21 @@ async def main():
         print(f"Logs found: {'Yes' if result.get('logs') else 'No'}")
         print(f"Metadata: {result.get('metadata', {})}")
         
-        # Uncomment to scrape all URLs
+        # Stream URLs from the file, skipping tasks saved by a previous run
         print("Scraping all URLs...")
-        results = await scraper.scrape_urls(urls)  # Scrape all URLs
-        print(f"Completed scraping {len(results)} URLs")
+        counts = await scraper.scrape_urls(scraper.stream_pending_urls())
+        total = counts["successful_scrapes"] + counts["failed_scrapes"]
+        print(f"Completed scraping {total} URLs, skipped {scraper.skipped_urls} already scraped")
         
-        # Save summary report
+        # Save summary report; per-task results are in results.jsonl
         summary = {
-            "total_urls": len(urls),
-            "successful_scrapes": len([r for r in results if not r.get('error')]),
-            "failed_scrapes": len([r for r in results if r.get('error')]),
-            "results": results
+            "total_urls": total + scraper.skipped_urls,
+            **counts,
+            "skipped_urls": scraper.skipped_urls,
+            "results_file": str(scraper.results_file)
         }
         
-        summary_file = Path("codex_tasks/scraping_summary.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(dump_json, summary, Path("codex_tasks/scraping_summary.json"))
         
         print(f"Summary: {summary['successful_scrapes']} successful, {summary['failed_scrapes']} failed")
         
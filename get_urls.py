@@ -6,11 +6,19 @@ Extracts all URLs matching pattern: https://chatgpt.com/codex/tasks/task_e_$HASH
 """
 
 import asyncio
-import re
+from datetime import datetime, timezone
 from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import json
 
 
+TASK_LINK_SELECTOR = 'a[href*="/codex/tasks/task_e_"]'
+
+# How long to wait (ms) for more tasks after each scroll; each timeout is
+# a retry with a longer wait before we decide the list has ended
+SCROLL_WAIT_TIMEOUTS = (500, 1000, 2000)
+
+
 async def extract_codex_urls():
     """Connect to Chrome via CDP and extract all Codex task URLs."""
     
@@ -44,34 +52,48 @@ async def extract_codex_urls():
             if "tab=archived" not in codex_page.url:
                 await codex_page.goto("https://chatgpt.com/codex?tab=archived")
         
-        # Wait for the page to load
-        await codex_page.wait_for_load_state("networkidle")
+        # Wait for the first task link rather than network idle, which a
+        # single-page app with background polling may never reach
+        try:
+            await codex_page.wait_for_selector(TASK_LINK_SELECTOR, timeout=15000)
+        except PlaywrightTimeoutError:
+            print("No task links appeared; the archive may be empty")
         
         # Scroll to load all tasks (if lazy loading is implemented)
         print("Scrolling to load all tasks...")
-        previous_height = 0
         while True:
-            # Get current scroll height
-            current_height = await codex_page.evaluate("document.body.scrollHeight")
+            # Scroll to bottom, remembering the height we scrolled from
+            height = await codex_page.evaluate("""
+                () => {
+                    const height = document.body.scrollHeight;
+                    window.scrollTo(0, height);
+                    return height;
+                }
+            """)
             
-            # Scroll to bottom
-            await codex_page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            # Wait a bit for new content to load
-            await asyncio.sleep(1)
-            
-            # Check if we've reached the end
-            new_height = await codex_page.evaluate("document.body.scrollHeight")
-            if new_height == previous_height:
+            # Continue as soon as new content grows the page, backing off
+            # before concluding we've reached the end
+            for timeout in SCROLL_WAIT_TIMEOUTS:
+                try:
+                    await codex_page.wait_for_function(
+                        "height => document.body.scrollHeight > height",
+                        arg=height,
+                        timeout=timeout,
+                    )
+                    break
+                except PlaywrightTimeoutError:
+                    continue
+            else:
                 break
-            previous_height = new_height
         
         print("Extracting URLs...")
         
-        # Extract all links matching the pattern
-        urls = await codex_page.evaluate("""
-            () => {
-                const links = document.querySelectorAll('a[href*="/codex/tasks/task_e_"]');
+        # Extract all links matching the pattern, validating and
+        # deduplicating in the page so only task URLs come back
+        valid_urls = await codex_page.evaluate("""
+            (selector) => {
+                const pattern = /^https:\\/\\/chatgpt\\.com\\/codex\\/tasks\\/task_e_[a-fA-F0-9]+/;
+                const links = document.querySelectorAll(selector);
                 const urls = new Set();
                 
                 links.forEach(link => {
@@ -79,17 +101,15 @@ async def extract_codex_urls():
                     if (href) {
                         // Convert relative URLs to absolute
                         const absoluteUrl = new URL(href, window.location.origin).href;
-                        urls.add(absoluteUrl);
+                        if (pattern.test(absoluteUrl)) {
+                            urls.add(absoluteUrl);
+                        }
                     }
                 });
                 
-                return Array.from(urls);
+                return Array.from(urls).sort();
             }
-        """)
-        
-        # Additional validation using regex
-        pattern = re.compile(r'https://chatgpt\.com/codex/tasks/task_e_[a-fA-F0-9]+')
-        valid_urls = [url for url in urls if pattern.match(url)]
+        """, TASK_LINK_SELECTOR)
         
         print(f"Found {len(valid_urls)} unique Codex task URLs")
         
@@ -111,7 +131,7 @@ async def save_urls_to_json(urls, filename="codex_urls.json"):
     """Save URLs to a JSON file with additional metadata."""
     data = {
         "total_count": len(urls),
-        "extraction_date": asyncio.get_event_loop().time(),
+        "extraction_date": datetime.now(timezone.utc).isoformat(),
         "urls": sorted(urls)
     }
     with open(filename, 'w') as f:
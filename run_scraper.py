@@ -6,7 +6,7 @@ Script to run the Codex scraper with various options.
 import asyncio
 import argparse
 from pathlib import Path
-from codex_scraper import CodexScraper
+from codex_scraper import CodexScraper, dump_json, read_urls
 
 async def main():
     parser = argparse.ArgumentParser(description='Scrape Codex task data from ChatGPT')
@@ -14,24 +14,36 @@ async def main():
     parser.add_argument('--limit', type=int, help='Limit number of URLs to scrape')
     parser.add_argument('--start', type=int, default=0, help='Start index for URL list')
     parser.add_argument('--batch-size', type=int, default=5, help='Batch size for processing')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-scrape tasks that already have saved output')
+    parser.add_argument('--serve', action='store_true',
+                        help='Keep the browser session open and scrape URLs read from stdin')
     
     args = parser.parse_args()
     
+    if args.serve:
+        scraper = CodexScraper(force_rescrape=args.force)
+        try:
+            await scraper.serve(max_concurrent=args.batch_size)
+        finally:
+            await scraper.close()
+        return
+    
     # Read URLs from file
-    urls = []
-    with open('codex_urls.txt', 'r') as f:
-        urls = [line.strip() for line in f if line.strip()]
+    urls = await read_urls()
+    
+    scraper = CodexScraper(force_rescrape=args.force)
     
-    # Apply start and limit
+    # Apply start, skip tasks saved by a previous run, then apply limit
     if args.start > 0:
         urls = urls[args.start:]
+    urls = await asyncio.to_thread(scraper.filter_pending, urls)
+    print(f"Skipping {scraper.skipped_urls} already scraped URLs")
     if args.limit:
         urls = urls[:args.limit]
     
     print(f"Found {len(urls)} URLs to scrape")
     
-    scraper = CodexScraper()
-    
     try:
         page = await scraper.connect_to_browser()
         if not page:
@@ -42,7 +54,7 @@ async def main():
             # Test with a single URL
             test_url = "https://chatgpt.com/codex/tasks/task_e_682bcb3a96a88323b415a5326b690b26"
             print("Testing with single URL...")
-            result = await scraper.extract_task_data(test_url)
+            result = await scraper.extract_task_data(page, test_url)
             await scraper.save_task_data(result)
             
             print("Test result:")
@@ -52,34 +64,22 @@ async def main():
         else:
             # Scrape specified URLs
             print(f"Scraping {len(urls)} URLs...")
-            results = await scraper.scrape_urls(urls, max_concurrent=args.batch_size)
-            print(f"Completed scraping {len(results)} URLs")
+            counts = await scraper.scrape_urls(urls, max_concurrent=args.batch_size)
+            print(f"Completed scraping {len(urls)} URLs")
             
-            # Save summary report
+            # Save summary report; per-task results are in results.jsonl
             summary = {
-                "total_urls": len(urls),
-                "successful_scrapes": len([r for r in results if not r.get('error')]),
-                "failed_scrapes": len([r for r in results if r.get('error')]),
+                "total_urls": len(urls) + scraper.skipped_urls,
+                **counts,
+                "skipped_urls": scraper.skipped_urls,
                 "start_index": args.start,
-                "results": results
+                "results_file": str(scraper.results_file)
             }
             
-            summary_file = Path("codex_tasks/scraping_summary.json")
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                import json
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(dump_json, summary, Path("codex_tasks/scraping_summary.json"))
             
             print(f"Summary: {summary['successful_scrapes']} successful, {summary['failed_scrapes']} failed")
-            
-            # Show some sample results
-            if results:
-                successful = [r for r in results if not r.get('error')]
-                if successful:
-                    sample = successful[0]
-                    print(f"\nSample result from {sample['task_id']}:")
-                    print(f"  Prompt: {sample.get('prompt', {}).get('text', 'N/A')[:100]}...")
-                    print(f"  Logs found: {'Yes' if sample.get('logs') and sample.get('logs', {}).get('has_content') else 'No'}")
-                    print(f"  Metadata: {sample.get('metadata', {})}")
+            print(f"Per-task results appended to {scraper.results_file}")
         
     finally:
         await scraper.close()
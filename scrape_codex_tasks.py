@@ -5,15 +5,73 @@ Connects to existing Chrome browser instance via CDP.
 """
 
 import asyncio
+import argparse
 import json
 import os
 from pathlib import Path
 from urllib.parse import urlparse
 from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Wait on the same elements as the scraper this script is used to debug
+from codex_scraper import LOGS_CONTAINER_SELECTOR, PROMPT_SELECTOR
 
 # Sample URL for testing
 SAMPLE_URL = "https://chatgpt.com/codex/tasks/task_e_682bcb3a96a88323b415a5326b690b26"
 
+# Summarizes every match of a selector in one round-trip; only the lengths
+# and a short preview cross CDP, not the (often huge) log text and HTML
+SUMMARIZE_LOGS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).flatMap((el, index) => {
+    const text = el.innerText;
+    // Only show elements with substantial content
+    if (text.length <= 100) return [];
+    return [{
+        index,
+        text_length: text.length,
+        html_length: el.innerHTML.length,
+        preview: text.slice(0, 200),
+    }];
+})
+"""
+
+# Candidate prompt elements as (label, CSS selector, required text or None).
+# Text matches are checked with plain DOM queries in one evaluate instead of
+# Playwright's :has-text() engine, which walks the whole DOM per selector.
+PROMPT_PROBES = [
+    ('div.px-4.text-sm.break-words.whitespace-pre-wrap',
+     'div.px-4.text-sm.break-words.whitespace-pre-wrap', None),
+    ('[class*="px-4"][class*="text-sm"][class*="break-words"]',
+     '[class*="px-4"][class*="text-sm"][class*="break-words"]', None),
+    ('div containing "View Settings"', 'div', 'View Settings'),
+    ('div containing "toggle"', 'div', 'toggle'),
+]
+
+PROBE_PROMPT_JS = """
+(probes) => probes.map(([label, selector, text]) => {
+    // Case-insensitive, like the :has-text() selectors these replace
+    const needle = text === null ? null : text.toLowerCase();
+    const el = Array.from(document.querySelectorAll(selector))
+        .find(el => needle === null || el.textContent.toLowerCase().includes(needle));
+    return el ? {label, text: el.innerText, html: el.innerHTML} : null;
+}).filter(found => found !== null)
+"""
+
+SCAN_DIVS_JS = """
+() => {
+    const divs = document.querySelectorAll('div');
+    const matches = [];
+    // Check first 20 divs
+    Array.from(divs).slice(0, 20).forEach((div, index) => {
+        const text = div.innerText;
+        if (text.length > 50 && text.includes('View Settings')) {
+            matches.push({index, classes: div.getAttribute('class'), text});
+        }
+    });
+    return {count: divs.length, matches};
+}
+"""
+
 async def connect_to_browser():
     """Connect to existing Chrome browser instance via CDP."""
     playwright = await async_playwright().start()
@@ -38,19 +96,29 @@ async def connect_to_browser():
     
     return playwright, browser, page
 
-async def analyze_page_structure(page, url):
-    """Navigate to URL and analyze the page structure."""
+async def analyze_page_structure(page, url, screenshots=False):
+    """Navigate to URL and analyze the page structure.
+    
+    With screenshots set, viewport JPEGs are saved before and after opening
+    the Logs tab.
+    """
     print(f"Navigating to: {url}")
+    task_id = url.rsplit('/', 1)[-1]
     
     try:
         # Navigate to the page with a longer timeout and different strategy
-        await page.goto(url, wait_until='load', timeout=60000)
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
         
-        # Wait for page to load
-        await page.wait_for_timeout(5000)
+        # Wait for the prompt to render rather than a fixed delay
+        try:
+            await page.wait_for_selector(PROMPT_SELECTOR, timeout=15000)
+        except PlaywrightTimeoutError:
+            print("Prompt element did not appear")
         
         # Take a screenshot for debugging
-        await page.screenshot(path=f"debug_screenshot_{url.split('/')[-1]}.png")
+        if screenshots:
+            await page.screenshot(path=f"debug_screenshot_{task_id}.jpg",
+                                  type='jpeg', quality=60, full_page=False)
         
         # Check if we're on the correct page
         current_url = page.url
@@ -62,51 +130,43 @@ async def analyze_page_structure(page, url):
         
         # Look for the prompt element
         print("\n--- Searching for prompt element ---")
-        prompt_selectors = [
-            'div.px-4.text-sm.break-words.whitespace-pre-wrap',
-            '[class*="px-4"][class*="text-sm"][class*="break-words"]',
-            'div:has-text("View Settings")',
-            'div:has-text("toggle")',
-        ]
-        
-        for selector in prompt_selectors:
-            try:
-                element = await page.query_selector(selector)
-                if element:
-                    text = await element.inner_text()
-                    html = await element.inner_html()
-                    print(f"Found element with selector '{selector}':")
-                    print(f"Text: {text}")
-                    print(f"HTML: {html}")
-                    print()
-            except Exception as e:
-                print(f"Error with selector '{selector}': {e}")
+        try:
+            for found in await page.evaluate(PROBE_PROMPT_JS, PROMPT_PROBES):
+                print(f"Found element with selector '{found['label']}':")
+                print(f"Text: {found['text']}")
+                print(f"HTML: {found['html']}")
+                print()
+        except Exception as e:
+            print(f"Error probing prompt selectors: {e}")
         
         # Look for tabs and logs
         print("\n--- Searching for tabs and logs ---")
         
-        # First, let's find all buttons on the page
-        all_buttons = await page.query_selector_all('button')
-        print(f"Found {len(all_buttons)} buttons on the page")
+        # First, let's find all buttons on the page, fetching every label in
+        # one call rather than one inner_text() round-trip per button
+        buttons = page.locator('button')
+        button_texts = await buttons.all_inner_texts()
+        print(f"Found {len(button_texts)} buttons on the page")
         
         logs_tab = None
-        for i, button in enumerate(all_buttons):
-            try:
-                text = await button.inner_text()
-                if 'Logs' in text:
-                    print(f"Button {i} contains 'Logs': {text}")
-                    logs_tab = button
-                    break
-            except:
-                continue
+        for i, text in enumerate(button_texts):
+            if 'Logs' in text:
+                print(f"Button {i} contains 'Logs': {text}")
+                logs_tab = buttons.nth(i)
+                break
         
         if logs_tab:
             print("Clicking on Logs tab...")
             await logs_tab.click()
-            await page.wait_for_timeout(2000)
+            try:
+                await page.wait_for_selector(LOGS_CONTAINER_SELECTOR, timeout=5000)
+            except PlaywrightTimeoutError:
+                print("Logs container did not appear")
             
             # Take screenshot after clicking logs
-            await page.screenshot(path=f"debug_logs_{url.split('/')[-1]}.png")
+            if screenshots:
+                await page.screenshot(path=f"debug_logs_{task_id}.jpg",
+                                      type='jpeg', quality=60, full_page=False)
             
             # Now look for the scrollable logs container
             log_selectors = [
@@ -119,16 +179,12 @@ async def analyze_page_structure(page, url):
             
             for selector in log_selectors:
                 try:
-                    elements = await page.query_selector_all(selector)
-                    for j, element in enumerate(elements):
-                        text = await element.inner_text()
-                        if len(text) > 100:  # Only show elements with substantial content
-                            html = await element.inner_html()
-                            print(f"Found logs element {j} with selector '{selector}':")
-                            print(f"Text length: {len(text)} chars")
-                            print(f"HTML length: {len(html)} chars")
-                            print(f"First 200 chars of text: {text[:200]}")
-                            print()
+                    for found in await page.evaluate(SUMMARIZE_LOGS_JS, selector):
+                        print(f"Found logs element {found['index']} with selector '{selector}':")
+                        print(f"Text length: {found['text_length']} chars")
+                        print(f"HTML length: {found['html_length']} chars")
+                        print(f"First 200 chars of text: {found['preview']}")
+                        print()
                 except Exception as e:
                     print(f"Error with logs selector '{selector}': {e}")
         else:
@@ -137,22 +193,17 @@ async def analyze_page_structure(page, url):
         # Get all elements that might contain task data
         print("\n--- General page analysis ---")
         
-        # Get all divs with text content
-        all_divs = await page.query_selector_all('div')
-        print(f"Found {len(all_divs)} div elements")
+        # Count the divs and filter the first 20 in the page, so only the
+        # matches cross CDP instead of a handle for every div
+        divs = await page.evaluate(SCAN_DIVS_JS)
+        print(f"Found {divs['count']} div elements")
         
         # Look for elements with substantial text
-        for i, div in enumerate(all_divs[:20]):  # Check first 20 divs
-            try:
-                text = await div.inner_text()
-                if len(text) > 50 and 'View Settings' in text:
-                    classes = await div.get_attribute('class')
-                    print(f"Div {i} with target text:")
-                    print(f"Classes: {classes}")
-                    print(f"Text: {text}")
-                    print()
-            except:
-                continue
+        for div in divs['matches']:
+            print(f"Div {div['index']} with target text:")
+            print(f"Classes: {div['classes']}")
+            print(f"Text: {div['text']}")
+            print()
         
         return True
         
@@ -162,6 +213,11 @@ async def analyze_page_structure(page, url):
 
 async def main():
     """Main function to run the scraper."""
+    parser = argparse.ArgumentParser(description='Analyze the structure of a Codex task page')
+    parser.add_argument('--screenshots', action='store_true',
+                        help='Save debug screenshots of the page')
+    args = parser.parse_args()
+    
     playwright, browser, page = await connect_to_browser()
     
     if not page:
@@ -170,7 +226,7 @@ async def main():
     
     try:
         # Analyze the sample URL first
-        success = await analyze_page_structure(page, SAMPLE_URL)
+        success = await analyze_page_structure(page, SAMPLE_URL, screenshots=args.screenshots)
         
         if success:
             print("Page analysis completed successfully")